@@ -2,14 +2,17 @@
 """Daily news digest scheduler.
 
 This script schedules and sends daily news digest emails at 7:00 AM.
-It can be run as a standalone service or configured as a cron job.
+It can be run as a standalone service, or invoked with --now from a cron
+job or the systemd timer in packaging/ (preferred).
 """
 
 import asyncio
 import os
+import selectors
+import signal
 import time
-from datetime import datetime, time as dt_time
-from typing import Optional
+from datetime import datetime, time as dt_time, timedelta
+from typing import List, Optional, Sequence
 
 try:
     from dotenv import load_dotenv
@@ -18,19 +21,56 @@ except ImportError:
 
 from news_agent.tools import send_daily_digest_email
 
+# Upper bound on digests being collected and sent at the same time, to stay
+# within NewsAPI rate limits
+MAX_CONCURRENT_DIGESTS = 16
 
-def should_send_digest(target_hour: int = 7, target_minute: int = 0) -> bool:
-    """Check if it's time to send the digest.
+
+def next_send_time(send_hour: int = 7, send_minute: int = 0) -> datetime:
+    """Get the next wall-clock time the digest should be sent.
 
     Args:
-        target_hour: Hour to send (0-23), default 7 for 7 AM
-        target_minute: Minute to send (0-59), default 0
+        send_hour: Hour to send (0-23), default 7 for 7 AM
+        send_minute: Minute to send (0-59), default 0
 
     Returns:
-        bool: True if current time matches target time
+        datetime: The next occurrence of the target time
     """
     now = datetime.now()
-    return now.hour == target_hour and now.minute == target_minute
+    target = datetime.combine(now.date(), dt_time(send_hour, send_minute))
+    if target <= now:
+        target += timedelta(days=1)
+    return target
+
+
+def sleep_until(target: datetime) -> None:
+    """Block until the wall clock reaches the target time.
+
+    On Python 3.13+ (Linux) this arms an absolute CLOCK_REALTIME timerfd, so
+    the wakeup lands on the exact second even across suspend or clock
+    adjustments. Elsewhere it falls back to a single relative sleep.
+
+    Args:
+        target: Local wall-clock time to wake up at
+    """
+    if hasattr(os, "timerfd_create"):
+        fd = os.timerfd_create(time.CLOCK_REALTIME)
+        try:
+            os.timerfd_settime(
+                fd, flags=os.TFD_TIMER_ABSTIME, initial=target.timestamp()
+            )
+            with selectors.DefaultSelector() as selector:
+                selector.register(fd, selectors.EVENT_READ)
+                selector.select()
+            os.read(fd, 8)
+        finally:
+            os.close(fd)
+    else:
+        # time.sleep runs on the monotonic clock; re-check the wall clock
+        # afterwards so a clock adjustment can't wake us early and make the
+        # next iteration schedule the same send twice.
+        while (delay := (target - datetime.now()).total_seconds()) > 0:
+            time.sleep(delay)
 
 
 def send_digest_now(user_id: str = "demo_user", recipient_email: Optional[str] = None):
@@ -52,47 +92,103 @@ def send_digest_now(user_id: str = "demo_user", recipient_email: Optional[str] =
     return result
 
 
+async def _send_digest_limited(
+    user_id: str,
+    recipient_email: Optional[str],
+    semaphore: asyncio.Semaphore,
+) -> dict:
+    """Send one user's digest in a worker thread once a slot is free."""
+    async with semaphore:
+        return await asyncio.to_thread(send_daily_digest_email, user_id, recipient_email)
+
+
+async def _send_all_digests(
+    user_ids: Sequence[str],
+    recipient_email: Optional[str],
+    max_concurrency: int,
+) -> List[dict]:
+    """Send digests for all users concurrently, bounded by a semaphore."""
+    semaphore = asyncio.Semaphore(max_concurrency)
+    return await asyncio.gather(*(
+        _send_digest_limited(user_id, recipient_email, semaphore)
+        for user_id in user_ids
+    ))
+
+
+def send_digests_now(
+    user_ids: Sequence[str],
+    recipient_email: Optional[str] = None,
+    max_concurrency: int = MAX_CONCURRENT_DIGESTS,
+) -> List[dict]:
+    """Send the daily digest to several users at once.
+
+    Each digest is network-bound (NewsAPI + SMTP), so users are processed in
+    parallel threads, at most max_concurrency at a time. Every digest is
+    mailed to the same recipient_email; there is no per-user address lookup.
+
+    Args:
+        user_ids: User identifiers
+        recipient_email: Email all digests are sent to (uses .env if not provided)
+        max_concurrency: Maximum digests in flight at once
+
+    Returns:
+        List[dict]: Result for each user, in the same order as user_ids
+    """
+    if len(user_ids) == 1:
+        return [send_digest_now(user_ids[0], recipient_email)]
+
+    print(f"\n[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] "
+          f"Sending daily digest to {len(user_ids)} users...")
+
+    results = asyncio.run(_send_all_digests(user_ids, recipient_email, max_concurrency))
+
+    for user_id, result in zip(user_ids, results):
+        if result.get("status") == "success":
+            print(f"✅ {user_id}: {result.get('message')}")
+        else:
+            print(f"❌ {user_id}: Error: {result.get('message')}")
+
+    return results
+
+
 def run_scheduler(
-    user_id: str = "demo_user",
+    user_ids: Sequence[str] = ("demo_user",),
     recipient_email: Optional[str] = None,
     send_hour: int = 7,
-    check_interval: int = 60
 ):
     """Run the scheduler continuously.
 
+    Sleeps until the next send time instead of polling the clock, so the
+    process wakes up once per day.
+
     Args:
-        user_id: User identifier
-        recipient_email: Email to send to
+        user_ids: User identifiers to send digests to
+        recipient_email: Email all digests are sent to
         send_hour: Hour to send (0-23), default 7 for 7 AM
-        check_interval: Seconds between checks, default 60
     """
     print("=" * 60)
     print("  Daily News Digest Scheduler")
     print("=" * 60)
     print(f"\nScheduled to send at: {send_hour}:00 every day")
-    print(f"Checking every: {check_interval} seconds")
-    print(f"User ID: {user_id}")
+    print(f"User IDs: {', '.join(user_ids)}")
     print(f"Recipient: {recipient_email or 'from .env'}")
     print("\nPress Ctrl+C to stop\n")
 
-    last_sent_date = None
+    # Treat SIGTERM (e.g. from systemd or docker stop) like Ctrl+C
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
 
     try:
         while True:
-            now = datetime.now()
-            current_date = now.date()
+            target = next_send_time(send_hour)
+            print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] "
+                  f"Next digest at {target.strftime('%Y-%m-%d %H:%M')}")
 
-            # Check if it's time to send and we haven't sent today yet
-            if should_send_digest(send_hour, 0) and last_sent_date != current_date:
-                send_digest_now(user_id, recipient_email)
-                last_sent_date = current_date
-                print(f"\n✓ Next digest scheduled for tomorrow at {send_hour}:00\n")
-            else:
-                # Show current time periodically
-                if now.minute % 10 == 0 and now.second < check_interval:
-                    print(f"[{now.strftime('%Y-%m-%d %H:%M:%S')}] Waiting for {send_hour}:00...")
+            # Block straight through to the send time; Ctrl+C still
+            # interrupts the wait immediately.
+            sleep_until(target)
 
-            time.sleep(check_interval)
+            send_digests_now(user_ids, recipient_email)
+            print(f"\n✓ Next digest scheduled for tomorrow at {send_hour}:00\n")
 
     except KeyboardInterrupt:
         print("\n\nScheduler stopped by user.")
@@ -105,12 +201,14 @@ def main():
     parser = argparse.ArgumentParser(description="Daily News Digest Scheduler")
     parser.add_argument(
         "--user-id",
-        default="demo_user",
-        help="User ID for personalization"
+        nargs="+",
+        default=["demo_user"],
+        help="User ID(s) for personalization; digests for several users are sent "
+             "concurrently, all to the same recipient (--email or RECIPIENT_EMAIL)"
     )
     parser.add_argument(
         "--email",
-        help="Recipient email address (overrides .env)"
+        help="Recipient email address for every digest (overrides .env)"
     )
     parser.add_argument(
         "--hour",
@@ -123,12 +221,6 @@ def main():
         action="store_true",
         help="Send digest immediately instead of scheduling"
     )
-    parser.add_argument(
-        "--interval",
-        type=int,
-        default=60,
-        help="Check interval in seconds (default 60)"
-    )
 
     args = parser.parse_args()
 
@@ -138,14 +230,13 @@ def main():
 
     if args.now:
         # Send immediately
-        send_digest_now(args.user_id, args.email)
+        send_digests_now(args.user_id, args.email)
     else:
         # Run scheduler
         run_scheduler(
-            user_id=args.user_id,
+            user_ids=args.user_id,
             recipient_email=args.email,
             send_hour=args.hour,
-            check_interval=args.interval
         )
 
 
@@ -5,8 +5,19 @@ This server receives feedback from the email buttons and records
 user preferences for personalization.
 """
 
+import gzip
+import html
 import os
-from urllib.parse import parse_qs
+import queue
+import signal
+import socket
+import sys
+import threading
+import time
+import traceback
+from collections import OrderedDict
+from http.server import ThreadingHTTPServer
+from urllib.parse import unquote_plus
 
 try:
     from dotenv import load_dotenv
@@ -14,7 +25,168 @@ try:
 except ImportError:
     pass
 
-from news_agent.user_preferences import record_feedback
+from news_agent.user_preferences import record_feedback_batch
+
+# Clicks are queued here and persisted in batches by a background writer
+FEEDBACK_QUEUE_SIZE = 10_000
+FLUSH_INTERVAL = 0.5  # seconds to keep collecting after the first event
+FLUSH_BATCH_SIZE = 100
+
+_FEEDBACK_QUEUE: "queue.Queue" = queue.Queue(maxsize=FEEDBACK_QUEUE_SIZE)
+
+# Repeat clicks (double-clicks, mail clients prefetching links) on the same
+# button within this window are acknowledged but not recorded again
+DEDUP_WINDOW = 10.0  # seconds
+DEDUP_MAX_ENTRIES = 10_000
+
+_recent_clicks: "OrderedDict[tuple, float]" = OrderedDict()
+_recent_clicks_lock = threading.Lock()
+
+
+_SUCCESS_HTML = """
+<!DOCTYPE html>
+<html>
+<head>
+    <title>Feedback Recorded</title>
+    <style>
+        body {
+            font-family: Arial, sans-serif;
+            display: flex;
+            justify-content: center;
+            align-items: center;
+            height: 100vh;
+            margin: 0;
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+        }
+        .container {
+            background: white;
+            padding: 40px;
+            border-radius: 10px;
+            text-align: center;
+            box-shadow: 0 4px 6px rgba(0,0,0,0.1);
+        }
+        h1 {
+            color: #333;
+            margin-bottom: 20px;
+        }
+        p {
+            color: #666;
+            font-size: 18px;
+        }
+        .emoji {
+            font-size: 64px;
+            margin-bottom: 20px;
+        }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="emoji">{emoji}</div>
+        <h1>Thank You!</h1>
+        <p>Your feedback has been recorded.</p>
+        <p>We'll use this to personalize your future news digests.</p>
+    </div>
+</body>
+</html>
+"""
+
+_ERROR_HTML = """
+<!DOCTYPE html>
+<html>
+<head>
+    <title>Error</title>
+    <style>
+        body {
+            font-family: Arial, sans-serif;
+            display: flex;
+            justify-content: center;
+            align-items: center;
+            height: 100vh;
+            margin: 0;
+            background: #f44336;
+        }
+        .container {
+            background: white;
+            padding: 40px;
+            border-radius: 10px;
+            text-align: center;
+        }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <h1>Oops!</h1>
+        <p>Something went wrong recording your feedback.</p>
+        <p>%s</p>
+    </div>
+</body>
+</html>
+"""
+
+# Response bodies are rendered and encoded once at import time
+SUCCESS_BODIES = {
+    "like": _SUCCESS_HTML.replace("{emoji}", "👍").encode(),
+    "dislike": _SUCCESS_HTML.replace("{emoji}", "👎").encode(),
+}
+ERROR_TEMPLATE = _ERROR_HTML.encode()
+SUCCESS_BODIES_GZIP = {
+    action: gzip.compress(body, compresslevel=9)
+    for action, body in SUCCESS_BODIES.items()
+}
+
+
+# Fields carried by the feedback links in the digest email, with defaults
+_FEEDBACK_DEFAULTS = {
+    "user_id": "demo_user",
+    "article_id": "unknown",
+    "category": "general",
+    "action": "like",
+}
+
+
+def parse_feedback_query(query_string: str) -> dict:
+    """Extract the feedback fields from a /feedback query string.
+
+    Unknown keys are skipped and values are only percent-decoded when they
+    contain escapes, which avoids parse_qs's dict-of-lists for the handful
+    of fields the email links carry.
+
+    Args:
+        query_string: Raw query string (without the leading '?')
+
+    Returns:
+        dict: user_id, article_id, category and action values
+    """
+    params = dict(_FEEDBACK_DEFAULTS)
+    for pair in query_string.split("&"):
+        key, _, value = pair.partition("=")
+        if key in params and value:
+            if "%" in value or "+" in value:
+                value = unquote_plus(value)
+            params[key] = value
+    return params
+
+
+def _is_duplicate_click(key: tuple) -> bool:
+    """Check whether the same click was seen within DEDUP_WINDOW and record it.
+
+    Args:
+        key: (user_id, article_id, action) identifying the click
+
+    Returns:
+        bool: True if the click should be ignored as a duplicate
+    """
+    now = time.monotonic()
+    with _recent_clicks_lock:
+        last_seen = _recent_clicks.get(key)
+        if last_seen is not None and now - last_seen < DEDUP_WINDOW:
+            return True
+
+        _recent_clicks[key] = now
+        _recent_clicks.move_to_end(key)
+        if len(_recent_clicks) > DEDUP_MAX_ENTRIES:
+            _recent_clicks.popitem(last=False)
+        return False
 
 
 # Simple HTTP server to handle feedback
@@ -25,121 +197,80 @@ def create_feedback_handler():
     class FeedbackHandler(BaseHTTPRequestHandler):
         """HTTP handler for processing feedback requests."""
 
+        # Keep connections open between requests; every response carries a
+        # Content-Length so the client knows where each body ends.
+        protocol_version = "HTTP/1.1"
+
+        # Close persistent connections that sit idle this many seconds, so
+        # idle or stalled clients don't each hold a handler thread forever
+        timeout = 15
+
+        # Buffer the response so the status line, headers and body leave in
+        # a single send() when the request finishes, instead of one syscall
+        # for the headers and another for the body.
+        wbufsize = -1
+
         def do_GET(self):
             """Handle GET requests from email button clicks."""
             if self.path.startswith("/feedback"):
                 # Parse query parameters
                 if "?" in self.path:
-                    _, query_string = self.path.split("?", 1)
-                    params = parse_qs(query_string)
-
-                    user_id = params.get("user_id", ["demo_user"])[0]
-                    article_id = params.get("article_id", ["unknown"])[0]
-                    category = params.get("category", ["general"])[0]
-                    action = params.get("action", ["like"])[0]
-
-                    # Record the feedback
-                    result = record_feedback(user_id, article_id, category, action)
-
-                    # Send response
-                    self.send_response(200)
-                    self.send_header("Content-type", "text/html")
-                    self.end_headers()
-
-                    if result.get("status") == "success":
-                        response_html = f"""
-                        <!DOCTYPE html>
-                        <html>
-                        <head>
-                            <title>Feedback Recorded</title>
-                            <style>
-                                body {{
-                                    font-family: Arial, sans-serif;
-                                    display: flex;
-                                    justify-content: center;
-                                    align-items: center;
-                                    height: 100vh;
-                                    margin: 0;
-                                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                                }}
-                                .container {{
-                                    background: white;
-                                    padding: 40px;
-                                    border-radius: 10px;
-                                    text-align: center;
-                                    box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-                                }}
-                                h1 {{
-                                    color: #333;
-                                    margin-bottom: 20px;
-                                }}
-                                p {{
-                                    color: #666;
-                                    font-size: 18px;
-                                }}
-                                .emoji {{
-                                    font-size: 64px;
-                                    margin-bottom: 20px;
-                                }}
-                            </style>
-                        </head>
-                        <body>
-                            <div class="container">
-                                <div class="emoji">{'👍' if action == 'like' else '👎'}</div>
-                                <h1>Thank You!</h1>
-                                <p>Your feedback has been recorded.</p>
-                                <p>We'll use this to personalize your future news digests.</p>
-                            </div>
-                        </body>
-                        </html>
-                        """
-                    else:
-                        response_html = f"""
-                        <!DOCTYPE html>
-                        <html>
-                        <head>
-                            <title>Error</title>
-                            <style>
-                                body {{
-                                    font-family: Arial, sans-serif;
-                                    display: flex;
-                                    justify-content: center;
-                                    align-items: center;
-                                    height: 100vh;
-                                    margin: 0;
-                                    background: #f44336;
-                                }}
-                                .container {{
-                                    background: white;
-                                    padding: 40px;
-                                    border-radius: 10px;
-                                    text-align: center;
-                                }}
-                            </style>
-                        </head>
-                        <body>
-                            <div class="container">
-                                <h1>Oops!</h1>
-                                <p>Something went wrong recording your feedback.</p>
-                                <p>{result.get('message')}</p>
-                            </div>
-                        </body>
-                        </html>
-                        """
-
-                    self.wfile.write(response_html.encode())
+                    query_string = self.path.partition("?")[2]
+                    params = parse_feedback_query(query_string)
+
+                    user_id = params["user_id"]
+                    article_id = params["article_id"]
+                    category = params["category"]
+                    action = params["action"]
+
+                    if action not in SUCCESS_BODIES:
+                        self._send_html(400, b"<h1>400 Bad Request</h1><p>Unknown action</p>")
+                        return
+
+                    click_key = (user_id, article_id, action)
+                    if _is_duplicate_click(click_key):
+                        self._send_success(action)
+                        return
+
+                    # Queue the feedback; the writer thread persists it
+                    try:
+                        _FEEDBACK_QUEUE.put_nowait((
+                            user_id, article_id, category, action,
+                            time.time_ns(),
+                        ))
+                    except queue.Full:
+                        # Not recorded, so a retry must not count as a duplicate
+                        with _recent_clicks_lock:
+                            _recent_clicks.pop(click_key, None)
+                        message = html.escape("Server is busy, please try again shortly.")
+                        self._send_html(503, ERROR_TEMPLATE % message.encode())
+                        return
+
+                    self._send_success(action)
                 else:
                     # No parameters provided
-                    self.send_response(400)
-                    self.send_header("Content-type", "text/html")
-                    self.end_headers()
-                    self.wfile.write(b"<h1>400 Bad Request</h1><p>Missing parameters</p>")
+                    self._send_html(400, b"<h1>400 Bad Request</h1><p>Missing parameters</p>")
             else:
                 # Invalid path
-                self.send_response(404)
-                self.send_header("Content-type", "text/html")
-                self.end_headers()
-                self.wfile.write(b"<h1>404 Not Found</h1>")
+                self._send_html(404, b"<h1>404 Not Found</h1>")
+
+        def _send_success(self, action: str):
+            """Send the thank-you page, precompressed if the client accepts gzip."""
+            if "gzip" in self.headers.get("Accept-Encoding", ""):
+                self._send_html(200, SUCCESS_BODIES_GZIP[action], content_encoding="gzip")
+            else:
+                self._send_html(200, SUCCESS_BODIES[action])
+
+        def _send_html(self, code: int, body: bytes, content_encoding: str = None):
+            """Send an HTML response with an explicit Content-Length."""
+            self.send_response(code)
+            self.send_header("Content-type", "text/html; charset=utf-8")
+            if content_encoding:
+                self.send_header("Content-Encoding", content_encoding)
+            self.send_header("Vary", "Accept-Encoding")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
 
         def log_message(self, format, *args):
             """Custom log message format."""
@@ -148,30 +279,178 @@ def create_feedback_handler():
     return FeedbackHandler
 
 
-def run_server(port: int = 5000):
-    """Run the feedback webhook server.
+def _collect_batch() -> list:
+    """Block for the next event, then gather more for up to FLUSH_INTERVAL."""
+    batch = [_FEEDBACK_QUEUE.get()]
+    deadline = time.monotonic() + FLUSH_INTERVAL
+
+    while len(batch) < FLUSH_BATCH_SIZE and batch[-1] is not None:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            batch.append(_FEEDBACK_QUEUE.get(timeout=remaining))
+        except queue.Empty:
+            break
+
+    return batch
+
+
+def feedback_writer():
+    """Persist queued feedback in batches until a None sentinel is received."""
+    while True:
+        batch = _collect_batch()
+        events = [event for event in batch if event is not None]
+
+        if events:
+            result = record_feedback_batch(events)
+            if result.get("status") != "success":
+                print(f"❌ Error: {result.get('message')}")
+
+        if len(events) != len(batch):
+            return
+
+
+class FeedbackServer(ThreadingHTTPServer):
+    """Threaded HTTP server that can share its port with sibling workers."""
+
+    # socketserver's default backlog of 5 overflows when a digest goes out
+    # and clicks arrive in a burst; let the kernel queue as many as it allows.
+    request_queue_size = socket.SOMAXCONN
+
+    def __init__(self, server_address, handler_class, reuse_port: bool = False):
+        self.reuse_port = reuse_port
+        super().__init__(server_address, handler_class)
+
+    def server_bind(self):
+        """Bind the socket, enabling SO_REUSEPORT when running as a worker."""
+        if self.reuse_port:
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        super().server_bind()
+
+
+def _serve(port: int, reuse_port: bool = False):
+    """Serve feedback requests in this process until interrupted.
 
     Args:
-        port: Port to run the server on (default 5000)
+        port: Port to listen on
+        reuse_port: Share the port with other worker processes
     """
-    from http.server import HTTPServer
-
     handler = create_feedback_handler()
-    server = HTTPServer(("0.0.0.0", port), handler)
+    server = FeedbackServer(("0.0.0.0", port), handler, reuse_port=reuse_port)
+
+    writer = threading.Thread(target=feedback_writer, name="feedback-writer", daemon=True)
+    writer.start()
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        # Flush any queued feedback before exiting, without letting a
+        # repeated stop signal cut the flush short
+        signal.signal(signal.SIGTERM, signal.SIG_IGN)
+        _FEEDBACK_QUEUE.put(None)
+        writer.join()
+
+
+def _run_workers(port: int, workers: int) -> int:
+    """Fork worker processes that each accept on the same port.
+
+    The kernel load-balances incoming connections across the workers'
+    SO_REUSEPORT sockets. The parent only supervises and forwards shutdown;
+    if any worker dies, the others are stopped too so the service manager
+    sees the failure and can restart the whole server.
+
+    Args:
+        port: Port to listen on
+        workers: Number of worker processes to fork
 
+    Returns:
+        int: Exit status for the server (0 on a clean shutdown)
+    """
+    children = set()
+    for _ in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            # Workers shut down on SIGTERM from the parent, not on Ctrl+C,
+            # so a terminal interrupt can't cut a batch flush short.
+            signal.signal(signal.SIGINT, signal.SIG_IGN)
+            signal.signal(signal.SIGTERM, signal.default_int_handler)
+            code = 1
+            try:
+                _serve(port, reuse_port=True)
+                code = 0
+            except BaseException:
+                traceback.print_exc()
+            finally:
+                # os._exit skips interpreter cleanup, so flush buffered
+                # output (e.g. when redirected to a log) before leaving
+                try:
+                    sys.stdout.flush()
+                    sys.stderr.flush()
+                finally:
+                    os._exit(code)
+        children.add(pid)
+
+    status = 0
+    try:
+        # Workers only exit when told to, so any exit here is a failure
+        pid, wait_status = os.wait()
+        children.discard(pid)
+        code = os.waitstatus_to_exitcode(wait_status)
+        print(f"❌ Worker {pid} exited unexpectedly (exit code {code})")
+        status = 1
+    except KeyboardInterrupt:
+        pass
+
+    for pid in children:
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+    for pid in children:
+        try:
+            _, wait_status = os.waitpid(pid, 0)
+        except ChildProcessError:
+            continue
+        code = os.waitstatus_to_exitcode(wait_status)
+        if code != 0:
+            print(f"❌ Worker {pid} failed during shutdown (exit code {code})")
+            status = 1
+
+    return status
+
+
+def run_server(port: int = 5000, workers: int = 1):
+    """Run the feedback webhook server.
+
+    Args:
+        port: Port to run the server on (default 5000)
+        workers: Number of worker processes sharing the port (default 1)
+    """
     print("=" * 60)
     print("  Feedback Webhook Server")
     print("=" * 60)
     print(f"\nServer running on: http://localhost:{port}")
     print(f"Feedback endpoint: http://localhost:{port}/feedback")
+    if workers > 1:
+        print(f"Worker processes: {workers}")
     print("\nThis server tracks user feedback from email buttons.")
     print("Press Ctrl+C to stop\n")
 
-    try:
-        server.serve_forever()
-    except KeyboardInterrupt:
-        print("\n\nServer stopped by user.")
-        server.shutdown()
+    # Treat SIGTERM (e.g. from systemd or docker stop) like Ctrl+C
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+
+    if workers > 1:
+        if _run_workers(port, workers) != 0:
+            print("\n\nServer stopped: a worker process failed.")
+            sys.exit(1)
+    else:
+        _serve(port)
+
+    print("\n\nServer stopped by user.")
 
 
 def main():
@@ -185,9 +464,15 @@ def main():
         default=5000,
         help="Port to run the server on (default 5000)"
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes sharing the port via SO_REUSEPORT (default 1, Linux only)"
+    )
 
     args = parser.parse_args()
-    run_server(args.port)
+    run_server(args.port, args.workers)
 
 
 if __name__ == "__main__":
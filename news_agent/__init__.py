@@ -4,6 +4,13 @@ This package provides an AI-powered news agent built with Google's
 Agent Development Kit (ADK).
 """
 
-from .agent import root_agent
-
 __all__ = ["root_agent"]
+
+
+def __getattr__(name):
+    # Import the agent lazily so scripts that only need a submodule (e.g. the
+    # feedback server) don't pay for loading ADK and the agent tools.
+    if name == "root_agent":
+        from .agent import root_agent
+        return root_agent
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
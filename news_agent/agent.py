@@ -4,6 +4,9 @@ This module defines the main AI agent for delivering personalized news
 content to users based on their preferences and interests.
 """
 
+from functools import lru_cache
+from importlib import resources
+
 from google.adk.agents import Agent
 
 from .tools import (
@@ -15,62 +18,40 @@ from .tools import (
     search_news,
 )
 
-# Agent system instruction
-AGENT_INSTRUCTION = """You are a helpful personalized news assistant that helps users
-stay informed about topics they care about.
+# Agent system instruction, kept in data/agent_instruction.txt
+_INSTRUCTION_RESOURCE = "data/agent_instruction.txt"
 
-Your capabilities include:
-- Fetching news articles by category (technology, business, sports, health, science)
-- Searching for news on specific topics
-- Identifying trending topics
-- Saving articles to a user's reading list
-- Retrieving user preferences for personalization
-- Sending daily news digest emails with personalized content
-- Tracking user feedback (likes/dislikes) to improve personalization
-- Learning from user interactions to recommend better content
 
-IMPORTANT - EMAIL DIGEST TOOLS:
-- Use 'send_daily_digest_email' when the user asks to SEND or EMAIL a digest
-  Examples: "send me an email", "email me the digest", "send the daily news"
-  This tool handles everything: collects articles AND sends the email
-  Use user_id="demo_user" by default - DO NOT ask the user for their user ID
+@lru_cache(maxsize=1)
+def get_agent_instruction() -> str:
+    """Load the agent system instruction from the package data on first use."""
+    return resources.files(__package__).joinpath(_INSTRUCTION_RESOURCE).read_text(
+        encoding="utf-8"
+    )
 
-- Use 'collect_daily_digest' ONLY when user wants to SEE/PREVIEW articles without sending
-  Examples: "what's in today's digest?", "show me the articles", "preview the digest"
 
-PERSONALIZATION FEATURES:
-- You can send daily news digests at scheduled times (default 7:00 AM)
-- Each digest contains 6 articles with like/dislike buttons for user feedback
-- You learn from user feedback to personalize future recommendations
-- Articles are selected based on user's interaction history and preferences
+# Tools exposed to the agent, in registration order
+_TOOLS = (
+    get_current_datetime,
+    fetch_news_by_category,
+    search_news,
+    get_user_preferences,
+    save_article,
+    get_trending_topics,
+)
 
-When interacting with users:
-1. Be concise but informative when presenting news
-2. Organize information clearly with headlines and brief summaries
-3. Offer to provide more details if the user is interested
-4. Suggest related topics based on their interests
-5. Remember to check trending topics if users want to know what's popular
-6. Use personalized preferences to tailor content to their interests
-7. Offer to send daily digests if the user wants regular updates
-8. When sending emails, use user_id="demo_user" and recipient_email=None (uses .env config)
 
-Always be helpful, accurate, and respect the user's time by providing
-relevant information efficiently. If you don't have specific information,
-use the available tools to fetch it.
-"""
+@lru_cache(maxsize=1)
+def get_root_agent() -> Agent:
+    """Build the root agent once and share it across all callers."""
+    return Agent(
+        name="personalized_news_agent",
+        model="gemini-2.0-flash",
+        instruction=get_agent_instruction(),
+        description="A personalized news assistant that delivers relevant news content based on user preferences and interests.",
+        tools=list(_TOOLS),
+    )
+
 
 # Define the root agent
-root_agent = Agent(
-    name="personalized_news_agent",
-    model="gemini-2.0-flash",
-    instruction=AGENT_INSTRUCTION,
-    description="A personalized news assistant that delivers relevant news content based on user preferences and interests.",
-    tools=[
-        get_current_datetime,
-        fetch_news_by_category,
-        search_news,
-        get_user_preferences,
-        save_article,
-        get_trending_topics
-    ],
-)
+root_agent = get_root_agent()
@@ -4,39 +4,218 @@ This module handles sending HTML emails with news articles
 and tracking user preferences through like/dislike buttons.
 """
 
+import atexit
+import hashlib
+import html
 import os
+import queue
 import smtplib
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
-from typing import List, Dict
+from functools import lru_cache
+from typing import List, Dict, Optional, Tuple
+from urllib.parse import urlencode
 
 
+@lru_cache(maxsize=1)
 def _get_email_config() -> Dict[str, str]:
-    """Get email configuration from environment variables."""
-    return {
+    """Get email configuration from environment variables.
+
+    The result is cached for the life of the process; call
+    reset_email_config() after changing the environment.
+
+    Raises:
+        ValueError: If the email credentials are not configured
+    """
+    config = {
         "smtp_server": os.getenv("SMTP_SERVER", "smtp.gmail.com"),
         "smtp_port": int(os.getenv("SMTP_PORT", "587")),
         "email_address": os.getenv("EMAIL_ADDRESS"),
         "email_password": os.getenv("EMAIL_PASSWORD"),
         "recipient_email": os.getenv("RECIPIENT_EMAIL"),
     }
+    # Raising keeps a misconfigured environment out of the cache, so the
+    # check is repeated until the credentials are set
+    if not config["email_address"] or not config["email_password"]:
+        raise ValueError(
+            "Email credentials not configured. Set EMAIL_ADDRESS and EMAIL_PASSWORD in .env"
+        )
+    return config
 
 
-def create_news_digest_html(articles: List[Dict], user_id: str = "demo_user") -> str:
-    """Create HTML email template for news digest with like/dislike buttons.
+def _connect_smtp(config: Dict) -> smtplib.SMTP:
+    """Open, secure and authenticate a new SMTP connection."""
+    server = smtplib.SMTP(config["smtp_server"], config["smtp_port"], timeout=30)
+    try:
+        server.starttls()
+        server.login(config["email_address"], config["email_password"])
+    except Exception:
+        server.close()
+        raise
+    return server
 
-    Args:
-        articles: List of article dictionaries with title, summary, url, category
-        user_id: User identifier for tracking preferences
 
-    Returns:
-        str: HTML formatted email content
+def _quit_smtp(server: smtplib.SMTP) -> None:
+    """Close an SMTP connection, politely if the server is still there."""
+    try:
+        server.quit()
+    except (smtplib.SMTPException, OSError):
+        server.close()
+
+
+# Failures that only affect one message; the session stays usable
+_MESSAGE_ERRORS = (smtplib.SMTPRecipientsRefused, smtplib.SMTPDataError)
+
+
+class SMTPPool:
+    """Pool of authenticated SMTP connections reused across sends.
+
+    Connections are checked with NOOP before reuse and recycled after
+    max_messages sends, since many providers cap messages per session.
+    """
+
+    def __init__(self, config: Dict, size: int = 5, max_messages: int = 100):
+        self._config = config
+        self._max_messages = max_messages
+        self._slots = threading.BoundedSemaphore(size)
+        # LIFO so the most recently used (most likely still open) connection
+        # is reused first and surplus idle ones can time out server-side
+        self._idle: "queue.LifoQueue" = queue.LifoQueue()
+
+    def _checkout(self) -> Tuple[smtplib.SMTP, int]:
+        """Take a live idle connection, or open a new one."""
+        while True:
+            try:
+                server, remaining = self._idle.get_nowait()
+            except queue.Empty:
+                return _connect_smtp(self._config), self._max_messages
+            try:
+                if server.noop()[0] == 250:
+                    return server, remaining
+            except (smtplib.SMTPException, OSError):
+                pass
+            _quit_smtp(server)
+
+    def send_message(self, msg: MIMEMultipart) -> None:
+        """Send a message over a pooled connection.
+
+        Reconnects once if the server dropped the connection mid-send.
+        """
+        error = self.send_messages([msg])[0]
+        if error is not None:
+            raise error
+
+    def send_messages(self, messages: List[MIMEMultipart]) -> List[Optional[Exception]]:
+        """Send several messages over a single pooled connection.
+
+        Reconnects once per message if the server dropped the connection
+        mid-send, and recycles the connection when it reaches max_messages.
+        A message the server refuses doesn't stop the rest; a connection
+        failure leaves that message and all later ones unsent.
+
+        Returns:
+            List[Optional[Exception]]: Per message, None if it was sent,
+            otherwise the error that prevented it
+        """
+        errors: List[Optional[Exception]] = [None] * len(messages)
+        with self._slots:
+            server = None
+            remaining = 0
+            for i, msg in enumerate(messages):
+                try:
+                    if server is None:
+                        server, remaining = self._checkout()
+                    elif remaining <= 0:
+                        _quit_smtp(server)
+                        server = None
+                        server, remaining = _connect_smtp(self._config), self._max_messages
+                    try:
+                        server.send_message(msg)
+                    except smtplib.SMTPServerDisconnected:
+                        server.close()
+                        server = None
+                        server, remaining = _connect_smtp(self._config), self._max_messages
+                        server.send_message(msg)
+                except _MESSAGE_ERRORS as e:
+                    # smtplib resets the transaction, so the connection is reusable
+                    errors[i] = e
+                except Exception as e:
+                    if server is not None:
+                        _quit_smtp(server)
+                    errors[i:] = [e] * (len(messages) - i)
+                    return errors
+                remaining -= 1
+
+            if server is not None:
+                if remaining > 0:
+                    self._idle.put((server, remaining))
+                else:
+                    _quit_smtp(server)
+        return errors
+
+    def close(self) -> None:
+        """Close all idle connections."""
+        while True:
+            try:
+                server, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            _quit_smtp(server)
+
+
+_pool: Optional[SMTPPool] = None
+_pool_lock = threading.Lock()
+
+
+def _get_smtp_pool(config: Dict) -> SMTPPool:
+    """Get the process-wide SMTP pool, creating it on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = SMTPPool(
+                config,
+                size=int(os.getenv("SMTP_POOL_SIZE", "5")),
+                max_messages=int(os.getenv("SMTP_MAX_MESSAGES_PER_CONNECTION", "100")),
+            )
+            atexit.register(_pool.close)
+        return _pool
+
+
+def reset_email_config() -> None:
+    """Re-read the email configuration from the environment on next use.
+
+    Clears the cached config and closes the SMTP pool, which was opened
+    with the old server and credentials. Messages already being sent finish
+    on their existing connections.
     """
-    # Base URL for tracking - in production, this would be your server
-    # For now, we'll use localhost (you'll need to set up a simple web server)
-    base_url = os.getenv("FEEDBACK_BASE_URL", "http://localhost:5000")
+    global _pool
+    _get_email_config.cache_clear()
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
 
-    html = """
+def _get_email_executor() -> ThreadPoolExecutor:
+    """Get the process-wide email sending executor, creating it on first use."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=int(os.getenv("EMAIL_WORKERS", "4")),
+                thread_name_prefix="smtp",
+            )
+        return _executor
+
+
+# Static parts of the digest email, built once at import time
+_DIGEST_HEAD = """
     <!DOCTYPE html>
     <html>
     <head>
@@ -149,19 +328,7 @@ def create_news_digest_html(articles: List[Dict], user_id: str = "demo_user") ->
             </div>
     """
 
-    for i, article in enumerate(articles):
-        article_id = f"{user_id}_{i}_{article.get('title', '')[:20].replace(' ', '_')}"
-        category = article.get("category", "general")
-        title = article.get("title", "No title")
-        summary = article.get("summary", "")[:200] + "..."
-        url = article.get("url", "#")
-        source = article.get("source", "Unknown")
-
-        # Truncate long summaries
-        if len(summary) > 200:
-            summary = summary[:200] + "..."
-
-        html += f"""
+_DIGEST_ARTICLE = """
             <div class="article">
                 <span class="category">{category}</span>
                 <div class="article-title">
@@ -170,15 +337,15 @@ def create_news_digest_html(articles: List[Dict], user_id: str = "demo_user") ->
                 <div class="article-summary">{summary}</div>
                 <div class="article-source">Source: {source}</div>
                 <div class="feedback-buttons">
-                    <a href="{base_url}/feedback?article_id={article_id}&user_id={user_id}&action=like&category={category}"
+                    <a href="{like_url}"
                        class="btn btn-like">👍 Like</a>
-                    <a href="{base_url}/feedback?article_id={article_id}&user_id={user_id}&action=dislike&category={category}"
+                    <a href="{dislike_url}"
                        class="btn btn-dislike">👎 Dislike</a>
                 </div>
             </div>
         """
 
-    html += """
+_DIGEST_FOOTER = """
             <div class="footer">
                 <p>You're receiving this because you subscribed to daily news digests.</p>
                 <p>Your feedback helps us personalize your news experience.</p>
@@ -188,7 +355,72 @@ def create_news_digest_html(articles: List[Dict], user_id: str = "demo_user") ->
     </html>
     """
 
-    return html
+
+@lru_cache(maxsize=1)
+def _get_feedback_base_url() -> str:
+    """Get the feedback server base URL, read once per process.
+
+    Read lazily rather than at import so a .env loaded after importing
+    this module is still honoured.
+    """
+    # In production, this would be your server; the default assumes the
+    # local feedback_server.py
+    return os.getenv("FEEDBACK_BASE_URL", "http://localhost:5000").rstrip("/")
+
+
+def create_news_digest_html(articles: List[Dict], user_id: str = "demo_user") -> str:
+    """Create HTML email template for news digest with like/dislike buttons.
+
+    Args:
+        articles: List of article dictionaries with title, summary, url, category
+        user_id: User identifier for tracking preferences
+
+    Returns:
+        str: HTML formatted email content
+    """
+    feedback_url = f"{_get_feedback_base_url()}/feedback?"
+
+    parts = [_DIGEST_HEAD]
+
+    for article in articles:
+        category = article.get("category", "general")
+        title = article.get("title", "No title")
+        url = article.get("url", "#")
+        source = article.get("source", "Unknown")
+
+        # Stable, URL-safe identifier for the feedback links
+        article_id = hashlib.blake2b(title.encode(), digest_size=6).hexdigest()
+
+        # Truncate long summaries
+        summary = article.get("summary") or ""
+        if len(summary) > 200:
+            summary = summary[:200] + "..."
+
+        query = {
+            "article_id": article_id,
+            "user_id": user_id,
+            "action": "like",
+            "category": category,
+        }
+        like_url = feedback_url + urlencode(query)
+        query["action"] = "dislike"
+        dislike_url = feedback_url + urlencode(query)
+
+        # Article fields come from third-party feeds, so escape everything
+        # that is interpolated into the markup
+        parts.append(_DIGEST_ARTICLE.format(
+            category=html.escape(category),
+            title=html.escape(title),
+            url=html.escape(url),
+            summary=html.escape(summary),
+            source=html.escape(source),
+            like_url=html.escape(like_url),
+            dislike_url=html.escape(dislike_url),
+        ))
+
+    parts.append(_DIGEST_FOOTER)
+
+    return "".join(parts)
 
 
 def send_email(
@@ -209,13 +441,10 @@ def send_email(
         dict: Status of the email sending operation
     """
     try:
-        config = _get_email_config()
-
-        if not config["email_address"] or not config["email_password"]:
-            return {
-                "status": "error",
-                "message": "Email credentials not configured. Set EMAIL_ADDRESS and EMAIL_PASSWORD in .env"
-            }
+        try:
+            config = _get_email_config()
+        except ValueError as e:
+            return {"status": "error", "message": str(e)}
 
         from_email = from_email or config["email_address"]
 
@@ -229,11 +458,8 @@ def send_email(
         html_part = MIMEText(html_content, "html")
         msg.attach(html_part)
 
-        # Send email
-        with smtplib.SMTP(config["smtp_server"], config["smtp_port"]) as server:
-            server.starttls()
-            server.login(config["email_address"], config["email_password"])
-            server.send_message(msg)
+        # Send email over a pooled connection
+        _get_smtp_pool(config).send_message(msg)
 
         return {
             "status": "success",
@@ -245,3 +471,101 @@ def send_email(
             "status": "error",
             "message": f"Failed to send email: {str(e)}"
         }
+
+
+def send_email_bulk(
+    to_emails: List[str],
+    subject: str,
+    html_content: str,
+    from_email: str = None,
+) -> dict:
+    """Send the same HTML email to many recipients over one SMTP session.
+
+    Each recipient gets their own message with a personal To header, but
+    all of them share one authenticated connection, so the TLS and login
+    handshake is paid once rather than per address.
+
+    Args:
+        to_emails: Recipient email addresses
+        subject: Email subject line
+        html_content: HTML formatted email body
+        from_email: Sender email (optional, will use config if not provided)
+
+    Returns:
+        dict: Status of the operation, with the addresses that were "sent"
+            and the "failed" ones ({"email", "error"}) so a retry can skip
+            recipients who already got the email
+    """
+    try:
+        try:
+            config = _get_email_config()
+        except ValueError as e:
+            return {"status": "error", "message": str(e)}
+
+        from_email = from_email or config["email_address"]
+
+        messages = []
+        for to_email in to_emails:
+            msg = MIMEMultipart("alternative")
+            msg["Subject"] = subject
+            msg["From"] = from_email
+            msg["To"] = to_email
+            msg.attach(MIMEText(html_content, "html"))
+            messages.append(msg)
+
+        errors = _get_smtp_pool(config).send_messages(messages)
+
+        sent = [to_email for to_email, error in zip(to_emails, errors) if error is None]
+        failed = [
+            {"email": to_email, "error": str(error)}
+            for to_email, error in zip(to_emails, errors)
+            if error is not None
+        ]
+
+        if failed:
+            return {
+                "status": "error",
+                "message": f"Email sent to {len(sent)} of {len(messages)} recipients",
+                "sent": sent,
+                "failed": failed,
+            }
+
+        return {
+            "status": "success",
+            "message": f"Email sent successfully to {len(sent)} recipients",
+            "sent": sent,
+            "failed": [],
+        }
+
+    except Exception as e:
+        return {
+            "status": "error",
+            "message": f"Failed to send email: {str(e)}",
+            "sent": [],
+            "failed": [{"email": to_email, "error": str(e)} for to_email in to_emails],
+        }
+
+
+def send_email_async(
+    to_email: str,
+    subject: str,
+    html_content: str,
+    from_email: str = None,
+) -> Future:
+    """Send an HTML email in a background worker thread.
+
+    Workers share the SMTP connection pool, so concurrent sends reuse
+    authenticated connections instead of each opening its own.
+
+    Args:
+        to_email: Recipient email address
+        subject: Email subject line
+        html_content: HTML formatted email body
+        from_email: Sender email (optional, will use config if not provided)
+
+    Returns:
+        Future: Resolves to the status dict returned by send_email
+    """
+    return _get_email_executor().submit(
+        send_email, to_email, subject, html_content, from_email
+    )
@@ -4,12 +4,25 @@ This module defines tool functions that the AI agent can use to perform
 specific tasks like fetching news, filtering by category, and summarizing.
 """
 
+import atexit
+import functools
 import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import TimeoutError as FuturesTimeoutError
 from datetime import datetime
-from typing import Optional, List, Dict
+from typing import Callable, Optional, List, Dict
+from urllib.parse import quote, urlencode
 
 import httpx
 
+try:
+    from orjson import loads as _json_loads
+except ImportError:  # optional speedup, see requirements.txt
+    from json import loads as _json_loads
+
 from .email_service import create_news_digest_html, send_email
 from .user_preferences import (
     record_feedback,
@@ -20,30 +33,128 @@ from .user_preferences import (
 # NewsAPI configuration
 NEWSAPI_BASE_URL = "https://newsapi.org/v2"
 
+# Categories supported by the /top-headlines endpoint
+_VALID_CATEGORIES = frozenset({
+    "business", "entertainment", "general", "health",
+    "science", "sports", "technology",
+})
+_VALID_CATEGORIES_STR = ", ".join(sorted(_VALID_CATEGORIES))
+
+# Map common region names to country codes
+_COUNTRY_MAP = {
+    "us": "us", "usa": "us", "united states": "us",
+    "uk": "gb", "gb": "gb", "united kingdom": "gb", "britain": "gb",
+    "de": "de", "germany": "de",
+    "fr": "fr", "france": "fr",
+    "ca": "ca", "canada": "ca",
+    "au": "au", "australia": "au",
+}
+
+# Shared client so repeated tool calls reuse pooled keep-alive connections
+# instead of redoing DNS, TCP and TLS setup for every request
+_CLIENT = httpx.Client(
+    base_url=NEWSAPI_BASE_URL,
+    timeout=30.0,
+    limits=httpx.Limits(max_keepalive_connections=10),
+)
+atexit.register(_CLIENT.close)
+
+# Worker threads for issuing independent NewsAPI requests concurrently.
+# Threads rather than asyncio, because the tools are called synchronously
+# from inside the agent runner's already-running event loop.
+_FETCH_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="newsapi")
+
+# After this many seconds the digest is sent without its slowest
+# categories, provided at least DIGEST_MIN_CATEGORIES came back
+DIGEST_FETCH_TIMEOUT = 5.0
+DIGEST_MIN_CATEGORIES = 2
+
+
+_API_KEY: Optional[str] = None
+
 
 def _get_api_key() -> str:
-    """Get the NewsAPI key from environment variables."""
-    api_key = os.getenv("NEWS_API_KEY")
-    if not api_key:
-        raise ValueError(
-            "NEWS_API_KEY environment variable not set. "
-            "Get a free API key at https://newsapi.org/register"
-        )
-    return api_key
+    """Get the NewsAPI key from environment variables.
+
+    The key is read once and then reused; while it is unset the
+    environment is checked again on every call.
+    """
+    global _API_KEY
+    if _API_KEY is None:
+        api_key = os.getenv("NEWS_API_KEY")
+        if not api_key:
+            raise ValueError(
+                "NEWS_API_KEY environment variable not set. "
+                "Get a free API key at https://newsapi.org/register"
+            )
+        _API_KEY = api_key
+    return _API_KEY
+
+
+def _ttl_cache(ttl: float, maxsize: int = 128, ok_status: str = "success") -> Callable:
+    """Cache successful dict results for ttl seconds.
+
+    Results whose "status" is not ok_status are never cached, so transient
+    API failures are retried on the next call.
+    """
+    def decorator(func: Callable) -> Callable:
+        cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+        lock = threading.Lock()
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items())))
+            now = time.monotonic()
+            with lock:
+                entry = cache.get(key)
+                if entry is not None and entry[0] > now:
+                    cache.move_to_end(key)
+                    return entry[1]
+
+            result = func(*args, **kwargs)
+
+            if result.get("status") == ok_status:
+                with lock:
+                    cache[key] = (now + ttl, result)
+                    cache.move_to_end(key)
+                    if len(cache) > maxsize:
+                        cache.popitem(last=False)
+            return result
+
+        wrapper.cache_clear = cache.clear
+        return wrapper
+
+    return decorator
+
+
+@_ttl_cache(ttl=300, maxsize=256, ok_status="ok")
+def _newsapi_get(endpoint: str, params: tuple) -> dict:
+    """GET a NewsAPI endpoint and return the decoded JSON body.
+
+    Responses are cached for five minutes per (endpoint, params), since
+    the agent often repeats identical queries within a session. params
+    must be a hashable tuple of (key, value) pairs, e.g.
+    tuple(sorted(params.items())).
+    """
+    # The params are already a flat tuple of pairs, so encode them directly
+    # rather than having httpx rebuild and normalize a QueryParams object
+    response = _CLIENT.get(f"{endpoint}?{urlencode(params, quote_via=quote)}")
+    response.raise_for_status()
+    return _json_loads(response.content)
 
 
 def _format_articles(articles: list) -> list:
     """Format API response articles into a consistent structure."""
-    formatted = []
-    for article in articles:
-        formatted.append({
+    return [
+        {
             "title": article.get("title", "No title"),
             "summary": article.get("description") or article.get("content", "No description available"),
-            "source": article.get("source", {}).get("name", "Unknown"),
+            "source": (article.get("source") or {}).get("name", "Unknown"),
             "url": article.get("url", ""),
             "published_at": article.get("publishedAt", ""),
-        })
-    return formatted
+        }
+        for article in articles
+    ]
 
 
 def get_current_datetime() -> dict:
@@ -55,13 +166,26 @@ def get_current_datetime() -> dict:
     Returns:
         dict: A dictionary containing the current datetime information.
     """
-    now = datetime.now()
+    return dict(_now_bucket(int(time.time())))
+
+
+_WEEKDAYS = (
+    "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday",
+)
+
+
+@functools.lru_cache(maxsize=2)
+def _now_bucket(sec: int) -> dict:
+    """Format the datetime info once per wall-clock second."""
+    now = datetime.fromtimestamp(sec)
+    iso = now.isoformat(timespec="seconds")
+    date, time_of_day = iso.split("T")
     return {
         "status": "success",
-        "datetime": now.isoformat(),
-        "date": now.strftime("%Y-%m-%d"),
-        "time": now.strftime("%H:%M:%S"),
-        "day_of_week": now.strftime("%A"),
+        "datetime": iso,
+        "date": date,
+        "time": time_of_day,
+        "day_of_week": _WEEKDAYS[now.weekday()],
     }
 
 
@@ -79,34 +203,23 @@ def fetch_news_by_category(category: str, limit: int = 5) -> dict:
     Returns:
         dict: A dictionary containing news articles for the category.
     """
-    valid_categories = [
-        "business", "entertainment", "general", "health",
-        "science", "sports", "technology"
-    ]
-
     category_lower = category.lower()
-    if category_lower not in valid_categories:
+    if category_lower not in _VALID_CATEGORIES:
         return {
             "status": "error",
-            "message": f"Unknown category: {category}. Available: {', '.join(valid_categories)}",
+            "message": f"Unknown category: {category}. Available: {_VALID_CATEGORIES_STR}",
             "articles": [],
         }
 
     try:
         api_key = _get_api_key()
 
-        with httpx.Client(timeout=30.0) as client:
-            response = client.get(
-                f"{NEWSAPI_BASE_URL}/top-headlines",
-                params={
-                    "category": category_lower,
-                    "language": "en",
-                    "pageSize": min(limit, 100),
-                    "apiKey": api_key,
-                }
-            )
-            response.raise_for_status()
-            data = response.json()
+        data = _newsapi_get("/top-headlines", (
+            ("apiKey", api_key),
+            ("category", category_lower),
+            ("language", "en"),
+            ("pageSize", min(limit, 100)),
+        ))
 
         if data.get("status") != "ok":
             return {
@@ -157,19 +270,13 @@ def search_news(query: str, limit: int = 5) -> dict:
     try:
         api_key = _get_api_key()
 
-        with httpx.Client(timeout=30.0) as client:
-            response = client.get(
-                f"{NEWSAPI_BASE_URL}/everything",
-                params={
-                    "q": query,
-                    "language": "en",
-                    "sortBy": "publishedAt",
-                    "pageSize": min(limit, 100),
-                    "apiKey": api_key,
-                }
-            )
-            response.raise_for_status()
-            data = response.json()
+        data = _newsapi_get("/everything", (
+            ("apiKey", api_key),
+            ("language", "en"),
+            ("pageSize", min(limit, 100)),
+            ("q", query),
+            ("sortBy", "publishedAt"),
+        ))
 
         if data.get("status") != "ok":
             return {
@@ -271,27 +378,11 @@ def get_trending_topics(region: Optional[str] = None) -> dict:
             "apiKey": api_key,
         }
 
-        # Map common region names to country codes
-        country_map = {
-            "us": "us", "usa": "us", "united states": "us",
-            "uk": "gb", "gb": "gb", "united kingdom": "gb", "britain": "gb",
-            "de": "de", "germany": "de",
-            "fr": "fr", "france": "fr",
-            "ca": "ca", "canada": "ca",
-            "au": "au", "australia": "au",
-        }
-
         if region:
-            country_code = country_map.get(region.lower(), region.lower())
-            params["country"] = country_code
+            region_lower = region.lower()
+            params["country"] = _COUNTRY_MAP.get(region_lower, region_lower)
 
-        with httpx.Client(timeout=30.0) as client:
-            response = client.get(
-                f"{NEWSAPI_BASE_URL}/top-headlines",
-                params=params
-            )
-            response.raise_for_status()
-            data = response.json()
+        data = _newsapi_get("/top-headlines", tuple(sorted(params.items())))
 
         if data.get("status") != "ok":
             return {
@@ -306,20 +397,25 @@ def get_trending_topics(region: Optional[str] = None) -> dict:
         seen = set()
 
         for article in articles:
-            title = article.get("title", "")
-            # Get first few words as topic indicator
-            if title and title not in seen:
+            title = article.get("title") or ""
+            # Compare on a normalized prefix so the same story syndicated
+            # with a different source suffix (" - CNN" / " - CNN.com") is
+            # only listed once
+            key = title[:48].lower().rstrip()
+            if key and key not in seen:
+                seen.add(key)
                 topics.append({
                     "headline": title,
-                    "source": article.get("source", {}).get("name", "Unknown"),
+                    "source": (article.get("source") or {}).get("name", "Unknown"),
                 })
-                seen.add(title)
+                if len(topics) == 10:  # Return top 10
+                    break
 
         return {
             "status": "success",
             "region": region or "global",
             "count": len(topics),
-            "topics": topics[:10],  # Return top 10
+            "topics": topics,
             "updated_at": datetime.now().isoformat(),
         }
 
@@ -349,7 +445,8 @@ def collect_daily_digest(user_id: str = "demo_user") -> dict:
         user_id: The unique identifier for the user.
 
     Returns:
-        dict: A dictionary containing collected articles for the digest.
+        dict: A dictionary containing collected articles for the digest;
+            "partial" is True if slow categories were left out.
     """
     try:
         # Get user's preferred categories or use defaults
@@ -370,11 +467,37 @@ def collect_daily_digest(user_id: str = "demo_user") -> dict:
             for cat in favorite_categories[:3]:
                 categories_to_fetch.append((cat, 2))
 
+        # Fetch all categories concurrently
+        futures = {
+            _FETCH_EXECUTOR.submit(fetch_news_by_category, category, limit=count): i
+            for i, (category, count) in enumerate(categories_to_fetch)
+        }
+        results = [None] * len(categories_to_fetch)
+        partial = False
+
+        try:
+            for future in as_completed(futures, timeout=DIGEST_FETCH_TIMEOUT):
+                results[futures[future]] = future.result()
+        except FuturesTimeoutError:
+            pending = [f for f in futures if not f.done()]
+            covered = sum(
+                1 for result in results
+                if result is not None and result.get("status") == "success"
+            )
+            if covered >= DIGEST_MIN_CATEGORIES:
+                # Enough for a useful digest; don't hold it for stragglers
+                partial = True
+                for future in pending:
+                    future.cancel()
+            else:
+                for future in as_completed(pending):
+                    results[futures[future]] = future.result()
+
         all_articles = []
 
-        for category, count in categories_to_fetch:
-            result = fetch_news_by_category(category, limit=count)
-            if result.get("status") == "success":
+        # Assemble in the original category order, skipping any cut off above
+        for (category, _), result in zip(categories_to_fetch, results):
+            if result is not None and result.get("status") == "success":
                 articles = result.get("articles", [])
                 # Add category to each article for tracking
                 for article in articles:
@@ -387,6 +510,7 @@ def collect_daily_digest(user_id: str = "demo_user") -> dict:
             "total_articles": len(all_articles),
             "articles": all_articles,
             "personalized": bool(favorite_categories),
+            "partial": partial,
         }
 
     except Exception as e:
@@ -5,30 +5,356 @@ based on their feedback (likes/dislikes) on news articles.
 """
 
 import json
-import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 
 
-# In production, this would be a database
+PREFERENCES_DB = "user_preferences.db"
+
+# Legacy JSON store, imported into the database once on first use
 PREFERENCES_FILE = "user_preferences.json"
 
+# Recent feedback events kept per user; totals are kept as counters
+FEEDBACK_LOG_SIZE = 100
+
+# Recommended until a user has liked something
+_DEFAULT_FAVORITES: Tuple[str, ...] = ("technology", "science", "business")
+
+# Score change applied to the article's category for each action
+_SCORE_DELTAS = {"like": 1, "dislike": -1}
+
+# The connection is shared by all threads in the process; this serializes
+# its use. Other processes (feedback server workers) are coordinated by
+# SQLite's own file locking.
+_LOCK = threading.Lock()
+_conn: Optional[sqlite3.Connection] = None
+
+# (category, score) pairs, ranked positive categories, likes, dislikes
+_UserStats = Tuple[Tuple[Tuple[str, int], ...], Tuple[str, ...], int, int]
+
+# Per-user query results, reused until the database changes. Commits from
+# other connections bump PRAGMA data_version; our own commits clear it.
+_user_cache: Dict[str, _UserStats] = {}
+_user_cache_version: Optional[int] = None
+
+
+def _validate_legacy_preferences(preferences) -> None:
+    """Check the legacy JSON has the shape _import_legacy_preferences expects.
+
+    Raises:
+        ValueError: If the data is not a mapping of user IDs to records
+    """
+    if not isinstance(preferences, dict):
+        raise ValueError(f"{PREFERENCES_FILE}: expected an object of users")
+    for user_id, user_data in preferences.items():
+        if not (
+            isinstance(user_data, dict)
+            and isinstance(user_data.get("likes", []), list)
+            and isinstance(user_data.get("dislikes", []), list)
+            and isinstance(user_data.get("category_scores", {}), dict)
+            and all(
+                isinstance(entry, dict)
+                for key in ("likes", "dislikes")
+                for entry in user_data.get(key, [])
+            )
+        ):
+            raise ValueError(f"{PREFERENCES_FILE}: malformed record for user {user_id!r}")
+
+
+def _load_legacy_preferences() -> Dict:
+    """Load preferences from the legacy JSON file, if there is one.
+
+    A file that exists but can't be parsed is an error rather than an empty
+    store, so existing history is never silently dropped during the import.
+
+    Raises:
+        ValueError: If the file is not valid preferences JSON
+    """
+    try:
+        with open(PREFERENCES_FILE, "r") as f:
+            preferences = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except json.JSONDecodeError as e:
+        raise ValueError(f"{PREFERENCES_FILE} is not valid JSON: {e}") from e
+    _validate_legacy_preferences(preferences)
+    return preferences
+
+
+def _import_legacy_preferences(conn: sqlite3.Connection) -> None:
+    """Copy feedback and scores from the legacy JSON file into the database."""
+    for user_id, user_data in _load_legacy_preferences().items():
+        for action, key in (("like", "likes"), ("dislike", "dislikes")):
+            conn.executemany(
+                "INSERT INTO feedback (user_id, article_id, category, action, ts) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [
+                    (user_id, entry.get("article_id"), entry.get("category"),
+                     action, entry.get("timestamp"))
+                    for entry in user_data.get(key, [])
+                ],
+            )
+        conn.executemany(
+            "INSERT INTO category_scores (user_id, category, score) VALUES (?, ?, ?)",
+            [
+                (user_id, category, score)
+                for category, score in user_data.get("category_scores", {}).items()
+            ],
+        )
+
 
-def _load_preferences() -> Dict:
-    """Load user preferences from file."""
-    if os.path.exists(PREFERENCES_FILE):
+def _create_schema(conn: sqlite3.Connection) -> None:
+    """Create the tables and import any legacy JSON preferences."""
+    conn.execute(
+        """
+        CREATE TABLE feedback (
+            user_id TEXT NOT NULL,
+            article_id TEXT,
+            category TEXT,
+            action TEXT NOT NULL,
+            ts TEXT
+        )
+        """
+    )
+    conn.execute("CREATE INDEX feedback_user ON feedback (user_id)")
+    conn.execute(
+        """
+        CREATE TABLE category_scores (
+            user_id TEXT NOT NULL,
+            category TEXT NOT NULL,
+            score INTEGER NOT NULL,
+            PRIMARY KEY (user_id, category)
+        )
+        """
+    )
+    _import_legacy_preferences(conn)
+
+
+def _add_feedback_counts(conn: sqlite3.Connection) -> None:
+    """Keep per-user like/dislike totals and bound the feedback log."""
+    conn.execute(
+        """
+        CREATE TABLE feedback_counts (
+            user_id TEXT NOT NULL,
+            action TEXT NOT NULL,
+            count INTEGER NOT NULL,
+            PRIMARY KEY (user_id, action)
+        )
+        """
+    )
+    conn.execute(
+        "INSERT INTO feedback_counts (user_id, action, count) "
+        "SELECT user_id, action, COUNT(*) FROM feedback GROUP BY user_id, action"
+    )
+    conn.execute(
+        """
+        DELETE FROM feedback WHERE rowid IN (
+            SELECT rowid FROM (
+                SELECT rowid, ROW_NUMBER() OVER (
+                    PARTITION BY user_id ORDER BY rowid DESC
+                ) AS n
+                FROM feedback
+            )
+            WHERE n > ?
+        )
+        """,
+        (FEEDBACK_LOG_SIZE,),
+    )
+
+
+def _integer_timestamps(conn: sqlite3.Connection) -> None:
+    """Store feedback timestamps as integer nanoseconds since the epoch.
+
+    The column is rebuilt because a TEXT column would coerce integers back
+    to strings. Old local-time ISO strings are converted; unparseable ones
+    become NULL.
+    """
+    conn.execute(
+        """
+        CREATE TABLE feedback_new (
+            user_id TEXT NOT NULL,
+            article_id TEXT,
+            category TEXT,
+            action TEXT NOT NULL,
+            ts INTEGER
+        )
+        """
+    )
+    rows = []
+    for row in conn.execute(
+        "SELECT rowid, user_id, article_id, category, action, ts FROM feedback"
+    ):
         try:
-            with open(PREFERENCES_FILE, "r") as f:
-                return json.load(f)
-        except Exception:
-            return {}
-    return {}
+            ts = int(datetime.fromisoformat(row[5]).timestamp() * 1_000_000) * 1000
+        except (TypeError, ValueError):
+            ts = None
+        rows.append(row[:5] + (ts,))
+    # Keep the rowids, which order the log for trimming
+    conn.executemany(
+        "INSERT INTO feedback_new (rowid, user_id, article_id, category, action, ts) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        rows,
+    )
+    conn.execute("DROP TABLE feedback")
+    conn.execute("ALTER TABLE feedback_new RENAME TO feedback")
+    conn.execute("CREATE INDEX feedback_user ON feedback (user_id)")
+
+
+# Schema migrations, applied in order; PRAGMA user_version records how
+# many have run against a database
+_MIGRATIONS = (
+    _create_schema,
+    _add_feedback_counts,
+    _integer_timestamps,
+)
+
+
+def _get_conn() -> sqlite3.Connection:
+    """Get the process-wide database connection, opening it on first use.
+
+    Must be called with _LOCK held.
+    """
+    global _conn
+    if _conn is None:
+        # Autocommit mode; write transactions are opened explicitly
+        conn = sqlite3.connect(
+            PREFERENCES_DB, check_same_thread=False, isolation_level=None
+        )
+        # Let readers proceed while a writer is active, and wait rather than
+        # fail when another process holds the write lock
+        conn.execute("PRAGMA busy_timeout=5000")
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+
+        # Re-check the version inside the write lock, as several processes
+        # may open a fresh database at once
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            for migrate in _MIGRATIONS[version:]:
+                migrate(conn)
+            conn.execute(f"PRAGMA user_version={len(_MIGRATIONS)}")
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            conn.close()
+            raise
+        _conn = conn
+    return _conn
+
+
+@contextmanager
+def _transaction():
+    """Run the enclosed statements as one write transaction."""
+    with _LOCK:
+        conn = _get_conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        _user_cache.clear()
+
 
+def _get_user_stats(user_id: str) -> _UserStats:
+    """Get a user's category scores, favorite categories and feedback counts.
 
-def _save_preferences(preferences: Dict) -> None:
-    """Save user preferences to file."""
-    with open(PREFERENCES_FILE, "w") as f:
-        json.dump(preferences, f, indent=2)
+    Served from memory unless the database has changed since the last read,
+    so the favorites are only re-ranked after feedback has been written.
+    """
+    global _user_cache_version
+    with _LOCK:
+        conn = _get_conn()
+        version = conn.execute("PRAGMA data_version").fetchone()[0]
+        if version != _user_cache_version:
+            _user_cache.clear()
+            _user_cache_version = version
+
+        stats = _user_cache.get(user_id)
+        if stats is None:
+            scores = tuple(conn.execute(
+                "SELECT category, score FROM category_scores "
+                "WHERE user_id = ? ORDER BY rowid",
+                (user_id,),
+            ).fetchall())
+            action_counts = dict(conn.execute(
+                "SELECT action, count FROM feedback_counts WHERE user_id = ?",
+                (user_id,),
+            ).fetchall())
+            # Categories the user has a net liking for, best first; callers
+            # take as many as they need
+            favorites = tuple(cat for cat, _ in sorted(
+                (item for item in scores if item[1] > 0),
+                key=lambda x: x[1],
+                reverse=True,
+            ))
+            stats = (
+                scores,
+                favorites,
+                action_counts.get("like", 0),
+                action_counts.get("dislike", 0),
+            )
+            _user_cache[user_id] = stats
+        return stats
+
+
+def _write_feedback(
+    conn: sqlite3.Connection,
+    events: List[Tuple[str, str, str, str, int]],
+) -> int:
+    """Insert feedback events and apply their net category score changes.
+
+    Score changes are summed per (user, category) first, so a batch costs
+    one upsert per category touched rather than one per event. Events
+    with an unknown action are ignored.
+
+    Returns:
+        int: Number of events written
+    """
+    rows = []
+    deltas: Dict[Tuple[str, str], int] = {}
+    counts: Dict[Tuple[str, str], int] = {}
+    for user_id, article_id, category, action, timestamp in events:
+        delta = _SCORE_DELTAS.get(action)
+        if delta is None:
+            continue
+        rows.append((user_id, article_id, category, action, timestamp))
+        deltas[(user_id, category)] = deltas.get((user_id, category), 0) + delta
+        counts[(user_id, action)] = counts.get((user_id, action), 0) + 1
+
+    conn.executemany(
+        "INSERT INTO feedback (user_id, article_id, category, action, ts) "
+        "VALUES (?, ?, ?, ?, ?)",
+        rows,
+    )
+    conn.executemany(
+        "INSERT INTO category_scores (user_id, category, score) VALUES (?, ?, ?) "
+        "ON CONFLICT (user_id, category) DO UPDATE SET score = score + excluded.score",
+        [(user_id, category, delta) for (user_id, category), delta in deltas.items()],
+    )
+    conn.executemany(
+        "INSERT INTO feedback_counts (user_id, action, count) VALUES (?, ?, ?) "
+        "ON CONFLICT (user_id, action) DO UPDATE SET count = count + excluded.count",
+        [(user_id, action, count) for (user_id, action), count in counts.items()],
+    )
+
+    # Keep only the most recent events per user in the log
+    conn.executemany(
+        "DELETE FROM feedback WHERE user_id = ? AND rowid <= ("
+        "SELECT rowid FROM feedback WHERE user_id = ? "
+        "ORDER BY rowid DESC LIMIT 1 OFFSET ?)",
+        [
+            (user_id, user_id, FEEDBACK_LOG_SIZE)
+            for user_id in {user_id for user_id, _ in counts}
+        ],
+    )
+    return len(rows)
 
 
 def record_feedback(
@@ -49,38 +375,55 @@ def record_feedback(
         dict: Status of the operation
     """
     try:
-        preferences = _load_preferences()
+        with _transaction() as conn:
+            _write_feedback(conn, [
+                (user_id, article_id, category, action, time.time_ns()),
+            ])
 
-        if user_id not in preferences:
-            preferences[user_id] = {
-                "likes": [],
-                "dislikes": [],
-                "category_scores": {},
-            }
+        return {
+            "status": "success",
+            "message": f"Feedback recorded: {action} for {category}",
+        }
 
-        # Record the feedback
-        feedback_entry = {
-            "article_id": article_id,
-            "category": category,
-            "timestamp": datetime.now().isoformat(),
+    except Exception as e:
+        return {
+            "status": "error",
+            "message": f"Failed to record feedback: {str(e)}",
         }
 
-        if action == "like":
-            preferences[user_id]["likes"].append(feedback_entry)
-            # Increase category score
-            current_score = preferences[user_id]["category_scores"].get(category, 0)
-            preferences[user_id]["category_scores"][category] = current_score + 1
-        elif action == "dislike":
-            preferences[user_id]["dislikes"].append(feedback_entry)
-            # Decrease category score
-            current_score = preferences[user_id]["category_scores"].get(category, 0)
-            preferences[user_id]["category_scores"][category] = current_score - 1
 
-        _save_preferences(preferences)
+def record_feedback_batch(events: List[Tuple[str, str, str, str, int]]) -> dict:
+    """Record several feedback events in a single transaction.
+
+    Rows are inserted with executemany and score changes are coalesced per
+    category, so a batch costs about as much as a single event.
+
+    Repeated clicks on the same button within the batch are only counted once.
+
+    Args:
+        events: (user_id, article_id, category, action, timestamp) tuples,
+            with the timestamp in nanoseconds since the epoch (time.time_ns())
+
+    Returns:
+        dict: Status of the operation
+    """
+    try:
+        seen = set()
+        unique_events = []
+        for event in events:
+            user_id, article_id, _, action, _ = event
+            key = (user_id, article_id, action)
+            if key not in seen:
+                seen.add(key)
+                unique_events.append(event)
+
+        with _transaction() as conn:
+            recorded = _write_feedback(conn, unique_events)
 
         return {
             "status": "success",
-            "message": f"Feedback recorded: {action} for {category}",
+            "message": f"Feedback recorded: {recorded} events",
+            "recorded": recorded,
         }
 
     except Exception as e:
@@ -90,49 +433,38 @@ def record_feedback(
         }
 
 
-def get_user_preferences_detailed(user_id: str) -> dict:
+def get_user_preferences_detailed(user_id: str, top_n: int = 3) -> dict:
     """Get detailed user preferences based on feedback history.
 
     Args:
         user_id: The user identifier
+        top_n: Number of favorite categories to include
 
     Returns:
         dict: User preferences including favorite categories and statistics
     """
     try:
-        preferences = _load_preferences()
+        scores, favorites, total_likes, total_dislikes = _get_user_stats(user_id)
+        category_scores = dict(scores)
 
-        if user_id not in preferences:
+        if not category_scores and not total_likes and not total_dislikes:
             # Return default preferences
             return {
                 "status": "success",
                 "user_id": user_id,
-                "favorite_categories": ["technology", "science", "business"],
+                "favorite_categories": list(_DEFAULT_FAVORITES[:top_n]),
                 "category_scores": {},
                 "total_likes": 0,
                 "total_dislikes": 0,
                 "engagement_rate": 0,
             }
 
-        user_data = preferences[user_id]
-        category_scores = user_data.get("category_scores", {})
-
-        # Sort categories by score
-        sorted_categories = sorted(
-            category_scores.items(),
-            key=lambda x: x[1],
-            reverse=True
-        )
-
-        # Get top 3 favorite categories
-        favorite_categories = [cat for cat, score in sorted_categories if score > 0][:3]
+        favorite_categories = list(favorites[:top_n])
 
         # If no favorites yet, use defaults
         if not favorite_categories:
-            favorite_categories = ["technology", "science", "business"]
+            favorite_categories = list(_DEFAULT_FAVORITES[:top_n])
 
-        total_likes = len(user_data.get("likes", []))
-        total_dislikes = len(user_data.get("dislikes", []))
         total_feedback = total_likes + total_dislikes
 
         engagement_rate = (total_likes / total_feedback * 100) if total_feedback > 0 else 0
@@ -164,5 +496,9 @@ def get_recommended_categories(user_id: str, limit: int = 3) -> List[str]:
     Returns:
         List[str]: List of recommended category names
     """
-    prefs = get_user_preferences_detailed(user_id)
-    return prefs.get("favorite_categories", ["technology", "science", "business"])[:limit]
+    # Straight from the ranked favorites; none of the statistics are needed
+    try:
+        _, favorites, _, _ = _get_user_stats(user_id)
+    except Exception:
+        favorites = ()
+    return list((favorites or _DEFAULT_FAVORITES)[:limit])
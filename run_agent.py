@@ -7,6 +7,7 @@ without using the CLI tools (adk web, adk run).
 
 import asyncio
 import os
+import sys
 import warnings
 from uuid import uuid4
 
@@ -15,6 +16,11 @@ try:
 except ImportError:
     load_dotenv = None
 
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 # Suppress the warning about non-text parts in responses (function calls)
 warnings.filterwarnings("ignore", message=".*non-text parts in the response.*")
 
@@ -25,20 +31,50 @@ from google.genai import types
 from news_agent import root_agent
 
 
-async def run_agent_interactive():
-    """Run the news agent in an interactive loop."""
-    # Load environment variables (for API keys)
-    if load_dotenv:
-        load_dotenv()
+# Bytes read from stdin that are not yet part of a returned line
+_stdin_buffer = bytearray()
+
+
+async def _prompt(prompt: str) -> str:
+    """Read a line from stdin without blocking the event loop.
+
+    Waits for stdin to become readable on the event loop itself, so no
+    thread is left blocked in input() if the session is interrupted.
+    Falls back to input() on a worker thread where the loop can't watch
+    stdin (Windows, or stdin redirected from a regular file).
+    """
+    print(prompt, end="", flush=True)
+    loop = asyncio.get_running_loop()
+    fd = sys.stdin.fileno()
+
+    while b"\n" not in _stdin_buffer:
+        readable = loop.create_future()
+        try:
+            loop.add_reader(fd, lambda: readable.done() or readable.set_result(None))
+        except (NotImplementedError, PermissionError):
+            return await asyncio.to_thread(input)
+        try:
+            await readable
+        finally:
+            loop.remove_reader(fd)
+
+        chunk = os.read(fd, 4096)
+        if not chunk:
+            if not _stdin_buffer:
+                raise EOFError
+            break
+        _stdin_buffer.extend(chunk)
+
+    line, _, rest = bytes(_stdin_buffer).partition(b"\n")
+    _stdin_buffer[:] = rest
+    return line.decode(sys.stdin.encoding or "utf-8", errors="replace")
 
-    # Verify API key is set
-    api_key = os.getenv("GOOGLE_API_KEY")
-    if not api_key:
-        print("Error: GOOGLE_API_KEY environment variable not set.")
-        print("Please set it in a .env file or export it in your shell:")
-        print("  export GOOGLE_API_KEY='your-api-key-here'")
-        return
 
+async def run_agent_interactive():
+    """Run the news agent in an interactive loop.
+
+    Expects the environment to be set up already; see main().
+    """
     # Create session service and runner
     session_service = InMemorySessionService()
     runner = Runner(
@@ -71,7 +107,7 @@ async def run_agent_interactive():
     while True:
         try:
             # Get user input
-            user_input = input("You: ").strip()
+            user_input = (await _prompt("You: ")).strip()
 
             if not user_input:
                 continue
@@ -86,10 +122,10 @@ async def run_agent_interactive():
                 parts=[types.Part.from_text(text=user_input)],
             )
 
-            # Run the agent and collect response
+            # Run the agent and print the response as it streams in
             print("\nAgent: ", end="", flush=True)
 
-            response_text = ""
+            got_any = False
             tool_calls_made = False
 
             async for event in runner.run_async(
@@ -103,21 +139,23 @@ async def run_agent_interactive():
                         for part in event.content.parts:
                             # Handle text parts
                             if hasattr(part, "text") and part.text:
-                                response_text += part.text
+                                print(part.text, end="", flush=True)
+                                got_any = True
                             # Detect function calls (tools being used)
                             elif hasattr(part, "function_call"):
                                 if not tool_calls_made:
                                     print("[thinking and using tools...] ", end="", flush=True)
                                     tool_calls_made = True
 
-            if response_text:
-                print(response_text)
+            if got_any:
+                print()
             else:
                 print("[No response generated]")
 
             print()  # Add spacing
 
-        except KeyboardInterrupt:
+        except (KeyboardInterrupt, asyncio.CancelledError):
+            # asyncio.run() turns Ctrl-C into cancellation of this task
             print("\n\nInterrupted. Goodbye!")
             break
         except Exception as e:
@@ -127,7 +165,20 @@ async def run_agent_interactive():
 
 def main():
     """Entry point for the script."""
-    asyncio.run(run_agent_interactive())
+    # Load environment variables (for API keys) before the event loop starts
+    if load_dotenv:
+        load_dotenv()
+
+    # Verify API key is set; the ADK model client reads it from the environment
+    if not os.getenv("GOOGLE_API_KEY"):
+        print("Error: GOOGLE_API_KEY environment variable not set.")
+        print("Please set it in a .env file or export it in your shell:")
+        print("  export GOOGLE_API_KEY='your-api-key-here'")
+        sys.exit(1)
+
+    # uvloop's faster event loop when installed, otherwise the default one
+    run = uvloop.run if uvloop else asyncio.run
+    run(run_agent_interactive())
 
 
 if __name__ == "__main__":
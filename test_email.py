@@ -17,12 +17,18 @@ from news_agent.tools import send_daily_digest_email
 
 def main():
     """Send a test digest email."""
+    # Snapshot the settings once so what is printed is what gets used
+    env = {
+        key: os.environ.get(key)
+        for key in ("EMAIL_ADDRESS", "EMAIL_PASSWORD", "RECIPIENT_EMAIL")
+    }
+
     print("=" * 60)
     print("  Testing Email Digest")
     print("=" * 60)
 
     # Check if email is configured
-    if not os.getenv("EMAIL_ADDRESS"):
+    if not env["EMAIL_ADDRESS"] or not env["EMAIL_PASSWORD"]:
         print("\n❌ Error: Email not configured!")
         print("\nPlease set these in your .env file:")
         print("  EMAIL_ADDRESS=sender@gmail.com")
@@ -32,12 +38,12 @@ def main():
         print("  https://support.google.com/accounts/answer/185833")
         return
 
-    print(f"\nSending from: {os.getenv('EMAIL_ADDRESS')}")
-    print(f"Sending to: {os.getenv('RECIPIENT_EMAIL')}")
+    print(f"\nSending from: {env['EMAIL_ADDRESS']}")
+    print(f"Sending to: {env['RECIPIENT_EMAIL']}")
     print("\nCollecting news articles and sending email...")
 
     # Send the digest
-    result = send_daily_digest_email()
+    result = send_daily_digest_email(recipient_email=env["RECIPIENT_EMAIL"])
 
     print("\n" + "=" * 60)
     if result.get("status") == "success":